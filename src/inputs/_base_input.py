@@ -335,7 +335,10 @@ class BaseInput:
     
     def dispatch_received_diag_packet(self, unframed_diag_packet):
         
-        opcode, payload = unframed_diag_packet[0], unframed_diag_packet[1:]
+        # Headers are parsed in place using offsets into the unframed packet,
+        # so that only the slices actually passed to modules are copied
+        
+        opcode = unframed_diag_packet[0]
         
         if opcode == DIAG_LOG_F: # This is a raw "log" structure
             
@@ -343,9 +346,10 @@ class BaseInput:
             # saved using the DLF format, generated by QXDM, only the inner
             # header is saved.
             
-            (pending_msgs, log_outer_length), inner_log_packet = unpack_from('<BH', payload), payload[calcsize('<BH'):]
+            inner_log_header_offset = calcsize('<BBH')
+            log_payload_offset = inner_log_header_offset + calcsize('<HHQ')
 
-            (log_inner_length, log_type, log_time), log_payload = unpack_from('<HHQ', inner_log_packet), inner_log_packet[calcsize('<HHQ'):]
+            log_inner_length, log_type, log_time = unpack_from('<HHQ', unframed_diag_packet, inner_log_header_offset)
             
             # Call the function that will dispatch the log packet, along with
             # metadata (log type, original inner header, timestamp)
@@ -357,8 +361,8 @@ class BaseInput:
             
             self.dispatch_diag_log(
                 log_type, # 16-bit log code
-                log_payload, # Inner log payload
-                inner_log_packet[:calcsize('<HHQ')], # Inner log header
+                unframed_diag_packet[log_payload_offset:], # Inner log payload
+                unframed_diag_packet[inner_log_header_offset:log_payload_offset], # Inner log header
                 time() # Timestamp
             )
         
@@ -366,11 +370,11 @@ class BaseInput:
             
             # See https://github.com/fgsect/scat/blob/f1538b3/parsers/qualcomm/qualcommparser.py#L331
             
-            self.dispatch_received_diag_packet(payload[7:])
+            self.dispatch_received_diag_packet(unframed_diag_packet[1 + 7:])
         
         elif opcode in (DIAG_MSG_F, DIAG_EXT_MSG_F, DIAG_EXT_MSG_TERSE_F, DIAG_QSR_EXT_MSG_TERSE_F, DIAG_QSR4_EXT_MSG_TERSE_F): # This is a "message" string
             
-            self.dispatch_diag_message(opcode, payload)
+            self.dispatch_diag_message(opcode, unframed_diag_packet[1:])
         
         else: # This is a "response"
             
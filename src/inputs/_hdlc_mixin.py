@@ -16,29 +16,49 @@ class HdlcMixin:
 
     ESCAPE_CHAR = b'\x7d'
     TRAILER_CHAR = b'\x7e'
+    
+    # Escaped forms of the two special characters, precomputed once
+    
+    ESCAPED_ESCAPE_CHAR = bytes([ESCAPE_CHAR[0], ESCAPE_CHAR[0] ^ 0x20])
+    ESCAPED_TRAILER_CHAR = bytes([ESCAPE_CHAR[0], TRAILER_CHAR[0] ^ 0x20])
 
     ccitt_crc16 = staticmethod(
         mkCrcFun(0x11021, initCrc=0, xorOut=0xffff)
     )
+    
+    # CRC-16 computed over a frame followed by its own (little-endian) valid
+    # CRC-16, which is constant for this CRC variant
+    
+    CRC16_GOOD_RESIDUE = 0x0f47
 
     """
         Utility function to add CRC + escape the message + add the trailer
         
-        :param payload: A raw payload to be encapsulated
+        :param packet_type: The first byte of the raw payload (int), the
+            Diag opcode
+        :param packet_payload: The subsequent bytes of the raw payload
     """
 
-    def hdlc_encapsulate(self, payload) -> bytes:
+    def hdlc_encapsulate(self, packet_type, packet_payload) -> bytearray:
         
-        debug('[>] Sending request %s of length %d: %s' % (message_id_to_name.get(payload[0], payload[0]), len(payload[1:]), payload[1:]))
+        debug('[>] Sending request %s of length %d: %s' % (message_id_to_name.get(packet_type, packet_type), len(packet_payload), packet_payload))
+        
+        # Build the raw payload directly into the output buffer
+        
+        payload = bytearray((packet_type,))
+        payload += packet_payload
         
         # Add the CRC16
         
         payload += pack('<H', self.ccitt_crc16(payload))
         
-        # Escape the message
+        # Escape the message (bytearray.replace() always copies, so only
+        # call it when needed)
         
-        payload = payload.replace(self.ESCAPE_CHAR, bytes([self.ESCAPE_CHAR[0], self.ESCAPE_CHAR[0] ^ 0x20]))
-        payload = payload.replace(self.TRAILER_CHAR, bytes([self.ESCAPE_CHAR[0], self.TRAILER_CHAR[0] ^ 0x20]))
+        if self.ESCAPE_CHAR in payload:
+            payload = payload.replace(self.ESCAPE_CHAR, self.ESCAPED_ESCAPE_CHAR)
+        if self.TRAILER_CHAR in payload:
+            payload = payload.replace(self.TRAILER_CHAR, self.ESCAPED_TRAILER_CHAR)
         
         # Add the trailer
         
@@ -65,19 +85,24 @@ class HdlcMixin:
             
             raise self.InvalidFrameError
         
-        # Remove the trailer
+        # Remove the trailer (the payload may also be a memoryview over the
+        # read buffer of an input, in which case it is copied only here)
         
         assert payload[-1:] == self.TRAILER_CHAR
-        payload = payload[:-1]
+        payload = bytes(payload[:-1])
         
-        # Unescape the message
+        # Unescape the message (most frames contain no escaped byte, in
+        # which case a single scan is done)
         
-        payload = payload.replace(bytes([self.ESCAPE_CHAR[0], self.TRAILER_CHAR[0] ^ 0x20]), self.TRAILER_CHAR)
-        payload = payload.replace(bytes([self.ESCAPE_CHAR[0], self.ESCAPE_CHAR[0] ^ 0x20]), self.ESCAPE_CHAR)
+        if self.ESCAPE_CHAR in payload:
+            
+            payload = payload.replace(self.ESCAPED_TRAILER_CHAR, self.TRAILER_CHAR)
+            payload = payload.replace(self.ESCAPED_ESCAPE_CHAR, self.ESCAPE_CHAR)
         
-        # Check the CRC16
+        # Check the CRC16 (over the whole frame including the CRC16, so that
+        # it does not have to be sliced apart nor re-encoded for valid frames)
         
-        if payload[-2:] != pack('<H', self.ccitt_crc16(payload[:-2])):
+        if self.ccitt_crc16(payload) != self.CRC16_GOOD_RESIDUE:
             
             warning('Ignoring (partial?) frame: Wrong CRC: %s (is: %02x, should be: %02x)' % (
                     repr(payload[:-2]),
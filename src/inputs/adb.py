@@ -243,7 +243,7 @@ class AdbConnector(HdlcMixin, BaseInput):
             
             self._relaunch_adb_bridge()
 
-            self.packet_buffer = b''
+            self.packet_buffer = bytearray()
             
             super().__init__()
     
@@ -370,7 +370,7 @@ class AdbConnector(HdlcMixin, BaseInput):
     
     def send_request(self, packet_type, packet_payload):
         
-        raw_payload = self.hdlc_encapsulate(bytes([packet_type]) + packet_payload)
+        raw_payload = self.hdlc_encapsulate(packet_type, packet_payload)
         
         self.socket.send(raw_payload)
     
@@ -392,7 +392,15 @@ class AdbConnector(HdlcMixin, BaseInput):
         
         while True:
             
-            while self.TRAILER_CHAR not in self.packet_buffer:
+            # Position from which to look for a trailer character, so that
+            # the bytes already present in the buffer are not scanned again
+            # after each read
+            
+            scan_start = 0
+            
+            while self.packet_buffer.find(self.TRAILER_CHAR, scan_start) == -1:
+                
+                scan_start = len(self.packet_buffer)
                 
                 # Read message from the TCP socket
                 
@@ -426,36 +434,49 @@ class AdbConnector(HdlcMixin, BaseInput):
                     
                     return
                 
-                self.packet_buffer += socket_read
+                self.packet_buffer.extend(socket_read)
             
-            while self.TRAILER_CHAR in self.packet_buffer:
-
-                # TODO: Add better auto-reconnect?
-                
-                # Parse frame
-                
-                raw_payload, self.packet_buffer = self.packet_buffer.split(self.TRAILER_CHAR, 1)
-                
-                # Decapsulate and dispatch
-                
-                try:
-                
-                    unframed_message = self.hdlc_decapsulate(
-                        payload = raw_payload + self.TRAILER_CHAR
-                    )
+            next_frame_start = 0
+            
+            with memoryview(self.packet_buffer) as packet_view:
                 
-                except self.InvalidFrameError:
+                while True:
+
+                    # TODO: Add better auto-reconnect?
                     
-                    # The first packet that we receive over the Diag input may
-                    # be partial
+                    # Parse frame
                     
-                    continue
-                
-                finally:
+                    trailer_pos = self.packet_buffer.find(self.TRAILER_CHAR, next_frame_start)
                     
-                    self.received_first_packet = True
-                
-                self.dispatch_received_diag_packet(unframed_message)
+                    if trailer_pos == -1:
+                        break
+                    
+                    frame_start, next_frame_start = next_frame_start, trailer_pos + 1
+                    
+                    # Decapsulate and dispatch
+                    
+                    try:
+                    
+                        unframed_message = self.hdlc_decapsulate(
+                            payload = packet_view[frame_start:next_frame_start]
+                        )
+                    
+                    except self.InvalidFrameError:
+                        
+                        # The first packet that we receive over the Diag input may
+                        # be partial
+                        
+                        continue
+                    
+                    finally:
+                        
+                        self.received_first_packet = True
+                    
+                    self.dispatch_received_diag_packet(unframed_message)
+            
+            # Only keep the trailing partial frame (if any)
+            
+            del self.packet_buffer[:next_frame_start]
 
     def dispose(self, disposing=True):
 
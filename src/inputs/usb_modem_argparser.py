@@ -1,7 +1,7 @@
 #!/usr/bin/python3
 #-*- encoding: Utf-8 -*-
 from typing import Optional, Union, Dict, List, Sequence, Set, Any
-from re import match, Match, IGNORECASE
+from re import compile, Match, Pattern, IGNORECASE
 from enum import IntEnum
 
 class UsbModemArgType(IntEnum):
@@ -21,6 +21,13 @@ USB_ARG_REGEX_TO_MODE = {
     'auto': UsbModemArgType.pyusb_auto
 }
 
+# Compiled once at import time rather than for each parsed argument
+
+USB_ARG_PATTERN_TO_MODE : Dict[Pattern, UsbModemArgType] = {
+    compile('^' + possible_syntax + '$', IGNORECASE): arg_type
+    for possible_syntax, arg_type in USB_ARG_REGEX_TO_MODE.items()
+}
+
 class UsbModemArgParser:
 
     arg_type : UsbModemArgType = None
@@ -46,8 +53,8 @@ class UsbModemArgParser:
         regex_result : Optional[Match] = None
         syntax_type : Optional[UsbModemArgType] = None
 
-        for possible_syntax, arg_type in USB_ARG_REGEX_TO_MODE.items():
-            regex_result = match('^' + possible_syntax + '$', arg, flags = IGNORECASE)
+        for syntax_pattern, arg_type in USB_ARG_PATTERN_TO_MODE.items():
+            regex_result = syntax_pattern.match(arg)
             if regex_result:
                 syntax_type = arg_type
                 break
@@ -220,7 +220,7 @@ class UsbModemPyserialConnector(HdlcMixin, BaseInput):
     
     def send_request(self, packet_type, packet_payload):
         
-        raw_payload = self.hdlc_encapsulate(bytes([packet_type]) + packet_payload)
+        raw_payload = self.hdlc_encapsulate(packet_type, packet_payload)
         
         self.serial.write(raw_payload)
     
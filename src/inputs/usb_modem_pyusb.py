@@ -8,30 +8,45 @@ from ._base_input import BaseInput
 
 from usb.util import dispose_resources
 from traceback import format_exc
-from usb.core import USBError
+from usb.core import USBError, USBTimeoutError
+from threading import Thread
 from typing import Optional
+from sys import platform
+from queue import SimpleQueue
+from array import array
+from errno import EPIPE
 from time import sleep
 
 class UsbModemPyusbConnector(HdlcMixin, BaseInput):
 
     dev_intf : Optional[PyusbDevInterface] = None
+    
+    NUM_TRANSFER_BUFFERS = 8
+    MIN_TRANSFER_SIZE = 256 * 1024 # A multiple of any wMaxPacketSize
+    MAX_WRITE_ATTEMPTS = 3
 
     def __init__(self, dev_intf : PyusbDevInterface):
+        self._disposed = False
 
         self.dev_intf = dev_intf
 
-        try:
-            status = self.dev_intf.device.is_kernel_driver_active(self.dev_intf.interface.index)
-        except Exception:
-            pass
-        else:
-            if status:
-                error('The USB modem device seems to be taken by a kernel driver, such as "usbserial" ' +
-                     'or "hso". Please pass directly a device name using an option like "--usb-modem /dev/ttyUSB2" ' +
-                     'or "/dev/ttyHS0" (on Linux) or "COM0" (on Windows) if it applies, or unmount the corresponding ' +
-                     'driver.')
+        # The kernel drivers looked for here ("usbserial", "hso"...) are
+        # Linux ones, don't issue a libusb request for this elsewhere
+
+        if platform.startswith('linux'):
 
-                exit()
+            try:
+                status = self.dev_intf.device.is_kernel_driver_active(self.dev_intf.interface.index)
+            except Exception:
+                pass
+            else:
+                if status:
+                    error('The USB modem device seems to be taken by a kernel driver, such as "usbserial" ' +
+                         'or "hso". Please pass directly a device name using an option like "--usb-modem /dev/ttyUSB2" ' +
+                         'or "/dev/ttyHS0" (on Linux) or "COM0" (on Windows) if it applies, or unmount the corresponding ' +
+                         'driver.')
+
+                    exit()
 
         try:
             # Needed on Windows, won't always work on Linux:
@@ -40,90 +55,236 @@ class UsbModemPyusbConnector(HdlcMixin, BaseInput):
             pass
 
         self.received_first_packet = False
+        
+        # Persistent buffer into which outgoing frames are copied. pyusb
+        # passes an array('B') as-is to its backend, while it would
+        # allocate a new array for each write when given bytes
+        
+        self.write_buffer = array('B')
 
         super().__init__()
 
-    def __del__(self):
-        
-        if self.dev_intf and self.dev_intf.device:
-            dispose_resources(self.dev_intf.device)
-
     def send_request(self, packet_type, packet_payload):
         
-        raw_payload = self.hdlc_encapsulate(bytes([packet_type]) + packet_payload)
+        raw_payload = self.hdlc_encapsulate(packet_type, packet_payload)
         
-        try:
-            self.dev_intf.write_endpoint.write(raw_payload)
-        except USBError:
-            error("[!] Can't write to the USB device. Maybe that you need " +
-                "root/administrator privileges, or that the device was unplugged? " + format_exc())
-
-    def read_loop(self):
+        # Resize the write buffer to the frame length (this only reallocates
+        # when the length changes), then copy the frame into it
+        
+        write_buffer = self.write_buffer
+        
+        if len(write_buffer) < len(raw_payload):
+            write_buffer.frombytes(bytes(len(raw_payload) - len(write_buffer)))
+        elif len(write_buffer) > len(raw_payload):
+            del write_buffer[len(raw_payload):]
+        
+        with memoryview(write_buffer) as write_view:
+            write_view[:] = raw_payload
         
-        read_buffer = b''
+        # Retry transient failures: a timeout (with a doubled timeout each
+        # time) or a stalled endpoint (after clearing the halt condition)
+        
+        write_timeout = self.dev_intf.device.default_timeout
+        
+        for attempt_index in range(self.MAX_WRITE_ATTEMPTS):
+            
+            try:
+                self.dev_intf.write_endpoint.write(write_buffer, timeout = write_timeout)
+            
+            except USBError as usb_error:
+                
+                is_stall = usb_error.errno == EPIPE
+                is_timeout = isinstance(usb_error, USBTimeoutError)
+                
+                if attempt_index == self.MAX_WRITE_ATTEMPTS - 1 or not (is_stall or is_timeout):
+                    error("[!] Can't write to the USB device. Maybe that you need " +
+                        "root/administrator privileges, or that the device was unplugged? " + format_exc())
+                    return
+                
+                debug('Retrying to write to the USB device: ' + str(usb_error))
+                
+                if is_stall:
+                    try:
+                        self.dev_intf.write_endpoint.clear_halt()
+                    except USBError:
+                        pass
+                else:
+                    write_timeout *= 2
+            
+            else:
+                return
 
+    """
+        Perform the USB bulk reads from a background thread, so that a
+        transfer is always pending on the read endpoint while read_loop()
+        is decapsulating and dispatching the previously received data.
+        
+        Reads are performed into preallocated transfer buffers taken from
+        self.free_transfer_buffers. A (transfer buffer, read length) tuple
+        is pushed to self.usb_read_queue for each read, and None is pushed
+        when the USB link was lost.
+        
+        The buffers are only returned to the pool once read_loop() has
+        copied their content, so the reads may run at most
+        NUM_TRANSFER_BUFFERS transfers ahead of the decapsulation and
+        dispatch of frames, and block beyond that (providing backpressure
+        without an additional bounded queue).
+    """
+    
+    def _usb_read_thread(self):
+        
         num_reconnect_retries = 0
-
+        
+        # Bind the methods used for each read to locals
+        
+        get_free_transfer_buffer = self.free_transfer_buffers.get
+        read_endpoint = self.dev_intf.read_endpoint.read
+        
         while True:
-                
-            # Read more bytes until a trailer character is found
-
-            read_size = self.dev_intf.read_endpoint.wMaxPacketSize or 0x200
             
-            while self.TRAILER_CHAR not in read_buffer:
-                
-                try:
-                    data_read = bytes(self.dev_intf.read_endpoint.read(read_size, timeout = 0x7fffffff))
-                    assert data_read
+            transfer_buffer = get_free_transfer_buffer()
+            
+            try:
+                read_length = read_endpoint(transfer_buffer, timeout = 0x7fffffff)
+                assert read_length
+            
+            except Exception:
                 
-                except Exception:
+                self.free_transfer_buffers.put(transfer_buffer)
 
-                    info('Connection from the USB link closed')
-                    debug('Reason for closing the link: ' + format_exc())
+                info('Connection from the USB link closed')
+                debug('Reason for closing the link: ' + format_exc())
 
-                    # Retry loop.
+                # Retry loop.
 
-                    if num_reconnect_retries >= 3:
-                        error('Connection to the USB link lost despite retries')
-                        exit()
-                    sleep(2)
-                    num_reconnect_retries += 1
+                if num_reconnect_retries >= 3:
+                    error('Connection to the USB link lost despite retries')
+                    self.usb_read_queue.put(None)
+                    return
+                sleep(2)
+                num_reconnect_retries += 1
 
-                else:
-                    num_reconnect_retries = 0
+            else:
+                num_reconnect_retries = 0
                 
-                read_buffer += data_read
-            
-            # Decapsulate and dispatch
-            
-            while self.TRAILER_CHAR in read_buffer:
+                self.usb_read_queue.put((transfer_buffer, read_length))
 
-                end_pos = read_buffer.index(self.TRAILER_CHAR) + 1
-                raw_payload = read_buffer[:end_pos]
-                read_buffer = read_buffer[end_pos:]
+    def read_loop(self):
+        
+        # Received bytes which do not form a complete frame yet
+        
+        read_buffer = bytearray()
+        
+        # Each transfer spans many USB packets, so that a burst of logs is
+        # received through a few large reads rather than one read per
+        # packet. A bulk read still completes as soon as the device sends a
+        # short packet, so this does not delay isolated responses.
+        
+        max_packet_size = self.dev_intf.read_endpoint.wMaxPacketSize or 0x200
+        
+        read_size = max(64 * max_packet_size, self.MIN_TRANSFER_SIZE)
+        
+        # Allocate the transfer buffers once, they are handed back and forth
+        # between the USB read thread and the current thread
+        
+        self.free_transfer_buffers = SimpleQueue()
+        
+        for buffer_index in range(self.NUM_TRANSFER_BUFFERS):
+            self.free_transfer_buffers.put(array('B', bytes(read_size)))
+        
+        self.usb_read_queue = SimpleQueue()
+        
+        Thread(target = self._usb_read_thread, daemon = True).start()
+        
+        # Bind the attributes and methods used for each transfer or frame to
+        # locals, sparing attribute lookups in the loops below
+        
+        get_transfer = self.usb_read_queue.get
+        put_free_transfer_buffer = self.free_transfer_buffers.put
+        find_in_read_buffer = read_buffer.find
+        trailer_char = self.TRAILER_CHAR
+        hdlc_decapsulate = self.hdlc_decapsulate
+        invalid_frame_error = self.InvalidFrameError
+        dispatch_received_diag_packet = self.dispatch_received_diag_packet
 
-                if raw_payload == self.TRAILER_CHAR:
-                    warning('(Received an empty diag frame)')
-                elif len(raw_payload) < 3:
-                    warning('(Received a too short diag frame)')
+        while True:
+            
+            transfer = get_transfer()
+            
+            if transfer is None:
+                return
+            
+            transfer_buffer, read_length = transfer
+            
+            # Only the newly received bytes have to be scanned for trailer
+            # characters, as the partial frame kept from previous reads
+            # contains none
+            
+            scan_start = len(read_buffer)
+            
+            with memoryview(transfer_buffer) as transfer_view:
+                read_buffer.extend(transfer_view[:read_length])
+            
+            put_free_transfer_buffer(transfer_buffer)
+            
+            # Decapsulate and dispatch every complete frame present in the
+            # buffer, frames being delimited by consecutive trailer characters,
+            # then only keep the trailing partial frame (if any)
+            
+            next_frame_start = 0
+            
+            with memoryview(read_buffer) as read_view:
                 
-                else:
+                while True:
                     
-                    try:
+                    trailer_pos = find_in_read_buffer(trailer_char, scan_start)
+                    
+                    if trailer_pos == -1:
+                        break
+                    
+                    frame_start, next_frame_start = next_frame_start, trailer_pos + 1
+                    frame_length = next_frame_start - frame_start
                     
-                        unframed_message = self.hdlc_decapsulate(
-                            payload = raw_payload
-                        )
+                    scan_start = next_frame_start
                     
-                    except self.InvalidFrameError:
+                    if frame_length == 1:
+                        warning('(Received an empty diag frame)')
+                    elif frame_length < 3:
+                        warning('(Received a too short diag frame)')
+                    
+                    else:
                         
-                        # The first packet that we receive over the Diag input may
-                        # be partial
+                        try:
+                            
+                            # The frame is passed as a view over the read
+                            # buffer, which is only copied once while being
+                            # unescaped (no reference to the view may outlive
+                            # this call, as the buffer is resized below)
                         
-                        continue
-                    
-                    finally:
+                            unframed_message = hdlc_decapsulate(
+                                payload = read_view[frame_start:next_frame_start]
+                            )
                         
-                        self.received_first_packet = True
-                    
-                    self.dispatch_received_diag_packet(unframed_message)
+                        except invalid_frame_error:
+                            
+                            # The first packet that we receive over the Diag input may
+                            # be partial
+                            
+                            continue
+                        
+                        finally:
+                            
+                            self.received_first_packet = True
+                        
+                        dispatch_received_diag_packet(unframed_message)
+            
+            if next_frame_start:
+                del read_buffer[:next_frame_start]
+
+    def dispose(self, disposing=True):
+
+        if not self._disposed:
+            if self.dev_intf and self.dev_intf.device:
+                dispose_resources(self.dev_intf.device)
+
+            self._disposed = True
@@ -8,21 +8,13 @@ from os.path import expanduser
 from pathlib import Path
 from sys import stderr
 
-from .modules.json_geo_dump import JsonGeoDumper
-from .modules.memory_dump import MemoryDumper
 from .modules.cli import CommandLineInterface
-from .modules.dlf_dump import DlfDumper
-from .modules.info import InfoRetriever
 from .modules._utils import FileType
 
-from .inputs.json_geo_read import JsonGeoReader
-from .inputs.usb_modem_pyserial import UsbModemPyserialConnector
-from .inputs.usb_modem_pyusb import UsbModemPyusbConnector
-from .inputs.usb_modem_pyusb_devfinder import PyusbDevInterface, PyusbDevNotFoundReason
 from .inputs.usb_modem_argparser import UsbModemArgParser, UsbModemArgType
-from .inputs.dlf_read import DlfReader
-from .inputs.adb import AdbConnector
-from .inputs.adb_wsl2 import AdbWsl2Connector
+
+# Other inputs and modules are imported from the branch which selects
+# them, so that only the dependencies actually used are loaded
 
 def main():
 
@@ -89,26 +81,35 @@ def main():
                 force = True, datefmt = '%H:%M:%S')
 
     if args.dlf_read:
+        from .inputs.dlf_read import DlfReader
         diag_input = DlfReader(args.dlf_read)
     elif args.adb_wsl2:
         win_adb_path = Path(args.adb_wsl2).resolve()
         if not win_adb_path.is_file():
             error("--adb-wsl2 is not a valid path to Windows adb executable")
             exit()
+        from .inputs.adb_wsl2 import AdbWsl2Connector
         diag_input = AdbWsl2Connector(f'{win_adb_path}')
         if diag_input.usb_modem and not diag_input.usb_modem.not_found_reason:
+            from .inputs.usb_modem_pyusb_devfinder import PyusbDevInterface
             usb_modem : PyusbDevInterface = diag_input.usb_modem
             if usb_modem.chardev_if_mounted:
+                from .inputs.usb_modem_pyserial import UsbModemPyserialConnector
                 diag_input = UsbModemPyserialConnector(usb_modem.chardev_if_mounted)
             else:
+                from .inputs.usb_modem_pyusb import UsbModemPyusbConnector
                 diag_input = UsbModemPyusbConnector(usb_modem)
     elif args.adb:
+        from .inputs.adb import AdbConnector
         diag_input = AdbConnector()
         if diag_input.usb_modem and not diag_input.usb_modem.not_found_reason:
+            from .inputs.usb_modem_pyusb_devfinder import PyusbDevInterface
             usb_modem : PyusbDevInterface = diag_input.usb_modem
             if usb_modem.chardev_if_mounted:
+                from .inputs.usb_modem_pyserial import UsbModemPyserialConnector
                 diag_input = UsbModemPyserialConnector(usb_modem.chardev_if_mounted)
             else:
+                from .inputs.usb_modem_pyusb import UsbModemPyusbConnector
                 diag_input = UsbModemPyusbConnector(usb_modem)
     elif args.usb_modem:
         usb_arg = UsbModemArgParser(args.usb_modem)
@@ -118,8 +119,10 @@ def main():
                     "--help for further details.")
             exit()
         elif usb_arg.arg_type == UsbModemArgType.pyserial_dev:
+            from .inputs.usb_modem_pyserial import UsbModemPyserialConnector
             diag_input = UsbModemPyserialConnector(usb_arg.pyserial_device)
         else:
+            from .inputs.usb_modem_pyusb_devfinder import PyusbDevInterface
             dev_intf = PyusbDevInterface.from_arg(usb_arg)
             if dev_intf.not_found_reason:
                 error('No Qualcomm Diag interface was found with the specified ' +
@@ -127,11 +130,14 @@ def main():
                 exit()
                 # TODO: Print a more user-friendly message here?
             elif dev_intf.chardev_if_mounted:
+                from .inputs.usb_modem_pyserial import UsbModemPyserialConnector
                 diag_input = UsbModemPyserialConnector(dev_intf.chardev_if_mounted)
             else:
+                from .inputs.usb_modem_pyusb import UsbModemPyusbConnector
                 diag_input = UsbModemPyusbConnector(dev_intf)
         
     elif args.json_geo_read:
+        from .inputs.json_geo_read import JsonGeoReader
         diag_input = JsonGeoReader(args.json_geo_read)
     else:
         raise NotImplementedError
@@ -143,6 +149,7 @@ def main():
     def parse_modules_args(args):
 
         if args.memory_dump:
+            from .modules.memory_dump import MemoryDumper
             diag_input.add_module(MemoryDumper(diag_input, expanduser(args.memory_dump), int(args.start, 16), int(args.stop, 16)))
         if args.pcap_dump:
             from .modules.pcap_dump import PcapDumper
@@ -151,13 +158,16 @@ def main():
             from .modules.pcap_dump import WiresharkLive
             diag_input.add_module(WiresharkLive(diag_input, args.reassemble_sibs, args.decrypt_nas, args.include_ip_traffic))
         if args.json_geo_dump:
+            from .modules.json_geo_dump import JsonGeoDumper
             diag_input.add_module(JsonGeoDumper(diag_input, args.json_geo_dump))
         if args.decoded_sibs_dump:
             from .modules.decoded_sibs_dump import DecodedSibsDumper
             diag_input.add_module(DecodedSibsDumper(diag_input))
         if args.info:
+            from .modules.info import InfoRetriever
             diag_input.add_module(InfoRetriever(diag_input))
         if args.dlf_dump:
+            from .modules.dlf_dump import DlfDumper
             diag_input.add_module(DlfDumper(diag_input, args.dlf_dump))
 
     # if args.efs_dump:
@@ -11,4 +11,8 @@ runner = TextTestRunner(verbosity = 2)
 
 import tests_usbmodem_argparser
 suite = loader.loadTestsFromModule(tests_usbmodem_argparser)
+runner.run(suite)
+
+import tests_hdlc_mixin
+suite = loader.loadTestsFromModule(tests_hdlc_mixin)
 runner.run(suite)
\ No newline at end of file
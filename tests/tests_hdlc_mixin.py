@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+#-*- encoding: Utf-8 -*-
+from os.path import dirname, realpath
+from unittest import TestCase
+
+TESTS_DIR = dirname(realpath(__file__))
+ROOT_DIR = dirname(TESTS_DIR)
+
+import sys
+sys.path.insert(0, ROOT_DIR)
+
+from src.inputs._hdlc_mixin import HdlcMixin
+
+"""
+    This file is an include file.
+
+    It should be run from the "tests.py" entry point
+    located into the current directory
+
+    It contains the tests for the
+    "src/inputs/_hdlc_mixin.py" file.
+"""
+
+class HdlcMixinTests(TestCase):
+
+    def setUp(self):
+        self.hdlc = HdlcMixin()
+
+    def test_crc16(self):
+        self.assertEqual(self.hdlc.ccitt_crc16(b'123456789'), 0x906e)
+
+    def test_encapsulate(self):
+        self.assertEqual(self.hdlc.hdlc_encapsulate(0x00, b'\x7e\x7d'),
+            b'\x00\x7d\x5e\x7d\x5d\x7a\x04\x7e')
+
+    def test_decapsulate_valid(self):
+        for payload in (b'\x00', b'\x4b\x12\x00\x00', b'\x7e\x7d\x7d\x5e', bytes(range(256))):
+            self.assertEqual(self.hdlc.hdlc_decapsulate(
+                self.hdlc.hdlc_encapsulate(payload[0], payload[1:])), payload)
+
+    def test_decapsulate_invalid(self):
+        with self.assertRaises(HdlcMixin.InvalidFrameError):
+            self.hdlc.hdlc_decapsulate(b'\x7e\x7e')
+
+        with self.assertLogs(level = 'WARNING'):
+            with self.assertRaises(HdlcMixin.InvalidFrameError):
+                self.hdlc.hdlc_decapsulate(b'\x00\x00\x00\x7e')